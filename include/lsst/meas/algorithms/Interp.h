@@ -29,6 +29,7 @@
 //
 #include <limits>
 #include <vector>
+#include "ndarray.h"
 #include "lsst/afw/image/Defect.h"
 #include "lsst/afw/image/MaskedImage.h"
 
@@ -106,6 +107,8 @@ private:
     unsigned int _type;                 //!< Type of defect
 };
 
+std::vector<Defect::Ptr> makeDefectList(ndarray::Array<int const, 2, 1> const &bboxes);
+
 template <typename MaskedImageT>
 void interpolateOverDefects(MaskedImageT &image,
                             lsst::afw::detection::Psf const &psf,
@@ -111,6 +111,8 @@ namespace lsst { namespace meas { namespace algorithms { namespace interp {} nam
 %shared_vec(lsst::meas::algorithms::Defect::Ptr);
 %shared_ptr(std::vector<lsst::meas::algorithms::Defect::Ptr>);
 
+%declareNumPyConverters(ndarray::Array<int const,2,1>)
+
 %include "lsst/meas/algorithms/Interp.h"
 
 /************************************************************************************************************/
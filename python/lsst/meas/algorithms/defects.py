@@ -22,15 +22,24 @@
 
 """Support for image defects"""
 
-import lsst.afw.geom as afwGeom
+import collections
+import os
+
+import numpy
+
 import lsst.pex.policy as policy
 import algorithmsLib
 
-def policyToBadRegionList(policyFile):
-    """Given a Policy file describing a CCD's bad pixels, return a vector of BadRegion::Ptr"""
+# Bad regions read from each policy file, keyed by absolute path; values are ((mtime, size), regions).
+# Least recently used first; only the last _badRegionCacheSize files are kept
+_badRegionCache = collections.OrderedDict()
+_badRegionCacheSize = 64
+
+def _readBadRegions(policyFile):
+    """Read a CCD's bad pixel Policy file, returning an (N, 4) array of [x0, y0, width, height]"""
 
     badPixelsPolicy = policy.Policy.createPolicy(policyFile)
-    badPixels = algorithmsLib.DefectListT()
+    regions = []
 
     if badPixelsPolicy.exists("Defects"):
         d = badPixelsPolicy.getArray("Defects")
@@ -48,9 +57,39 @@ def policyToBadRegionList(policyFile):
                 y1 = reg.get("y1")
                 height = y1 - y0 - 1
 
-            bbox = afwGeom.BoxI(afwGeom.PointI(x0, y0), afwGeom.ExtentI(width, height))
-            badPixels.push_back(algorithmsLib.Defect(bbox))
+            regions.append((x0, y0, width, height))
 
     del badPixelsPolicy
 
-    return badPixels
+    regions = numpy.array(regions, dtype=numpy.int32).reshape(-1, 4)
+    regions.flags.writeable = False     # it's shared by all callers
+
+    return regions
+
+def policyToBadRegionList(policyFile):
+    """Given a Policy file describing a CCD's bad pixels, return a vector of BadRegion::Ptr
+
+    If policyFile is a filename, the file is only parsed the first time it is seen (or after its
+    mtime or size changes); other Policy sources are parsed on every call.  A new vector of new
+    Defects is returned on every call, as the caller owns it and may modify it.
+    """
+    if not isinstance(policyFile, basestring):
+        return algorithmsLib.makeDefectList(_readBadRegions(policyFile))
+
+    path = os.path.abspath(policyFile)
+    try:
+        stat = os.stat(path)
+    except OSError:                     # let pex.policy report the problem, as it always has
+        return algorithmsLib.makeDefectList(_readBadRegions(policyFile))
+    key = (stat.st_mtime, stat.st_size)
+
+    cached = _badRegionCache.pop(path, None)
+    if cached is not None and cached[0] == key:
+        regions = cached[1]
+    else:
+        regions = _readBadRegions(path)
+        while len(_badRegionCache) >= _badRegionCacheSize:
+            _badRegionCache.popitem(last=False)
+    _badRegionCache[path] = (key, regions)
+
+    return algorithmsLib.makeDefectList(regions)
@@ -35,6 +35,7 @@
 #include <string>
 #include <typeinfo>
 #include <limits>
+#include <memory>
 #include "boost/format.hpp"
 
 #include "lsst/afw/geom.h"
@@ -2233,6 +2234,32 @@ std::pair<bool, typename MaskedImageT::Image::Pixel> interp::singlePixel(
     return std::make_pair(false, std::numeric_limits<typename MaskedImageT::Image::Pixel>::min());
 }
 
+/************************************************************************************************************/
+/**
+ * @brief Make a list of Defects from an (N, 4) array of [x0, y0, width, height]
+ *
+ * This lets python build the whole list in one call, rather than one push_back per defect
+ */
+std::vector<Defect::Ptr> makeDefectList(
+        ndarray::Array<int const, 2, 1> const &bboxes ///< the defects' corners and dimensions
+                                       ) {
+    if (bboxes.getSize<1>() != 4) {
+        throw LSST_EXCEPT(lsst::pex::exceptions::LengthError,
+                          (boost::format("Expected an array of shape (N, 4); saw (%d, %d)") %
+                           bboxes.getSize<0>() % bboxes.getSize<1>()).str());
+    }
+
+    std::vector<Defect::Ptr> badList;
+    badList.reserve(bboxes.getSize<0>());
+    for (ndarray::Array<int const, 2, 1>::Iterator row = bboxes.begin(), end = bboxes.end();
+         row != end; ++row) {
+        geom::BoxI const bbox(geom::PointI((*row)[0], (*row)[1]), geom::ExtentI((*row)[2], (*row)[3]));
+        badList.push_back(std::make_shared<Defect>(bbox));
+    }
+
+    return badList;
+}
+
 /************************************************************************************************************/
 //
 // Explicit instantiations
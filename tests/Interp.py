@@ -33,12 +33,15 @@ or
 """
 
 import os
+import tempfile
 import unittest
 import lsst.utils
 import math
 import numpy
 import lsst.utils.tests as tests
+import lsst.pex.exceptions as pexExceptions
 import lsst.pex.logging as logging
+import lsst.pex.policy as pexPolicy
 import lsst.afw.image as afwImage
 import lsst.afw.geom as afwGeom
 import lsst.afw.display.ds9 as ds9
@@ -251,12 +254,131 @@ class interpolationTestCase(unittest.TestCase):
 
 #-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
 
+class defectsTestCase(unittest.TestCase):
+    """A test case for building lists of Defects, from arrays and from Policy files"""
+    def setUp(self):
+        fd, self.policyFile = tempfile.mkstemp(suffix=".paf")
+        os.close(fd)
+        self.writePolicy([(10, 20, 2, 30)])
+        # start from an empty cache of parsed policy files
+        self.badRegionCache = defects._badRegionCache
+        defects._badRegionCache = type(self.badRegionCache)()
+        # count the times that the file is actually parsed
+        self.nRead = 0
+        self.readBadRegions = defects._readBadRegions
+        def countingReadBadRegions(policyFile):
+            self.nRead += 1
+            return self.readBadRegions(policyFile)
+        defects._readBadRegions = countingReadBadRegions
+
+    def tearDown(self):
+        defects._readBadRegions = self.readBadRegions
+        defects._badRegionCache = self.badRegionCache
+        os.remove(self.policyFile)
+
+    def writePolicy(self, regions):
+        with open(self.policyFile, "w") as fd:
+            fd.write("#<?cfg paf policy ?>\n")
+            for x0, y0, width, height in regions:
+                fd.write("Defects: {\n    x0: %d\n    width: %d\n    y0: %d\n    height: %d\n}\n" %
+                         (x0, width, y0, height))
+
+    def assertBBoxes(self, badPixels, regions):
+        self.assertEqual([defect.getBBox() for defect in badPixels],
+                         [afwGeom.BoxI(afwGeom.PointI(x0, y0), afwGeom.ExtentI(width, height))
+                          for x0, y0, width, height in regions])
+
+    def testMakeDefectList(self):
+        """Test building a list of Defects from an array of [x0, y0, width, height]"""
+
+        bboxes = numpy.array([[82, 663, 6, 8],
+                              [83, 659, 9, 6],
+                              ], dtype=numpy.int32)
+        badPixels = algorithms.makeDefectList(bboxes)
+
+        self.assertEqual(len(badPixels), len(bboxes))
+        for defect, (x0, y0, width, height) in zip(badPixels, bboxes):
+            self.assertEqual(defect.getBBox(),
+                             afwGeom.BoxI(afwGeom.PointI(x0, y0), afwGeom.ExtentI(width, height)))
+
+        self.assertEqual(len(algorithms.makeDefectList(numpy.zeros((0, 4), dtype=numpy.int32))), 0)
+        self.assertRaises(pexExceptions.LengthError,
+                          algorithms.makeDefectList, numpy.zeros((2, 3), dtype=numpy.int32))
+
+    def testCache(self):
+        """Test that re-reading an unchanged policy doesn't parse it, but returns new Defects"""
+
+        badPixels = defects.policyToBadRegionList(self.policyFile)
+        self.assertBBoxes(badPixels, [(10, 20, 2, 30)])
+        self.assertEqual(self.nRead, 1)
+
+        badPixels[0].classify(algorithms.Defect.WIDE, 1)
+
+        badPixels = defects.policyToBadRegionList(self.policyFile)
+        self.assertBBoxes(badPixels, [(10, 20, 2, 30)])
+        self.assertEqual(self.nRead, 1)
+        self.assertEqual(badPixels[0].getPos(), 0)
+        self.assertEqual(badPixels[0].getType(), 0)
+
+    def testModifiedPolicy(self):
+        """Test that a policy is re-read if its mtime or its size changes"""
+
+        defects.policyToBadRegionList(self.policyFile)
+        self.assertEqual(self.nRead, 1)
+        # same size, new mtime
+        stat = os.stat(self.policyFile)
+        self.writePolicy([(11, 21, 3, 31)])
+        os.utime(self.policyFile, (stat.st_atime, stat.st_mtime + 10))
+
+        badPixels = defects.policyToBadRegionList(self.policyFile)
+        self.assertBBoxes(badPixels, [(11, 21, 3, 31)])
+        self.assertEqual(self.nRead, 2)
+        # new size, same mtime (e.g. cp -p)
+        stat = os.stat(self.policyFile)
+        self.writePolicy([(11, 21, 3, 31), (40, 50, 6, 70)])
+        os.utime(self.policyFile, (stat.st_atime, stat.st_mtime))
+
+        badPixels = defects.policyToBadRegionList(self.policyFile)
+        self.assertBBoxes(badPixels, [(11, 21, 3, 31), (40, 50, 6, 70)])
+        self.assertEqual(self.nRead, 3)
+
+    def testCacheSize(self):
+        """Test that only the most recently used policy files are kept"""
+
+        fd, otherPolicyFile = tempfile.mkstemp(suffix=".paf")
+        os.write(fd, "#<?cfg paf policy ?>\n")
+        os.close(fd)
+        cacheSize = defects._badRegionCacheSize
+        defects._badRegionCacheSize = 1
+        try:
+            defects.policyToBadRegionList(self.policyFile)
+            defects.policyToBadRegionList(otherPolicyFile)
+            self.assertEqual(defects._badRegionCache.keys(), [os.path.abspath(otherPolicyFile)])
+
+            defects.policyToBadRegionList(self.policyFile)
+            self.assertEqual(self.nRead, 3)
+        finally:
+            defects._badRegionCacheSize = cacheSize
+            os.remove(otherPolicyFile)
+
+    def testPolicySource(self):
+        """Test that a PolicyFile is accepted, and parsed on every call"""
+
+        for nRead in (1, 2):
+            badPixels = defects.policyToBadRegionList(pexPolicy.PolicyFile(self.policyFile))
+            self.assertBBoxes(badPixels, [(10, 20, 2, 30)])
+            self.assertEqual(self.nRead, nRead)
+        self.assertEqual(len(defects._badRegionCache), 0)
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
+
 def suite():
     """Returns a suite containing all the test cases in this module."""
     tests.init()
 
     suites = []
     suites += unittest.makeSuite(interpolationTestCase)
+    suites += unittest.makeSuite(defectsTestCase)
     suites += unittest.makeSuite(tests.MemoryTestCase)
     return unittest.TestSuite(suites)
 